@@ -4,13 +4,21 @@ A command-line task management application with full CRUD operations,
 JSON persistence, and best practices implementation.
 """
 
+import os
+import sys
 import json
 import argparse
-from datetime import datetime
+from datetime import datetime, date
+from functools import lru_cache
 from typing import List, Dict, Optional
 from pathlib import Path
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 
 class Priority(Enum):
     """Task priority levels."""
@@ -19,52 +27,405 @@ class Priority(Enum):
     HIGH = "high"
 
 
+# Valid priority strings, for cheap membership checks on every add
+_PRIORITIES = frozenset(p.value for p in Priority)
+_PRIORITY_ERR = f"Priority must be one of: {', '.join(p.value for p in Priority)}"
+_PRIORITY_ICON = {"low": "◇", "medium": "◆", "high": "◆◆"}
+
+
+# Optional task fields, filled in on load so older task files can be
+# accessed by subscript like newly added tasks
+_TASK_DEFAULTS = {
+    'due_date': None,
+    'priority': None,
+    'category': None,
+    'completed': False,
+}
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def _loads(data: bytes):
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _check_tasks(tasks) -> List[Dict]:
+    """
+    Return tasks unchanged if it is a list of task dictionaries.
+    
+    Raises:
+        ValueError: If tasks is not a list of dicts with 'id' and 'description'
+    """
+    if not isinstance(tasks, list) or not all(
+        isinstance(t, dict) and 'id' in t and 'description' in t for t in tasks
+    ):
+        raise ValueError("Task file does not contain a list of tasks")
+    return tasks
+
+
+def _import_msgpack():
+    """Import msgpack on demand; only .msgpack task files need it."""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack is required for .msgpack task files (pip install msgpack)") from None
+    return msgpack
+
+
+@lru_cache(maxsize=1024)
+def _parse_due_date(due_date: str) -> date:
+    """
+    Parse a YYYY-MM-DD due date, caching the result per distinct string.
+    
+    Raises:
+        ValueError: If due_date is not a valid YYYY-MM-DD date
+    """
+    parsed = date.fromisoformat(due_date)
+    # fromisoformat also accepts forms like 20260125 on newer Pythons
+    if parsed.isoformat() != due_date:
+        raise ValueError(f"Invalid date: {due_date}")
+    return parsed
+
+
+def _normalize_due_date(due_date: str) -> str:
+    """
+    Rewrite a stored due date in canonical YYYY-MM-DD form.
+    
+    Older versions validated with strptime, which also accepted unpadded
+    dates such as 2026-1-5. Dates that can't be parsed are left as-is.
+    """
+    try:
+        _parse_due_date(due_date)
+    except ValueError:
+        try:
+            return datetime.strptime(due_date, "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            return due_date
+    return due_date
+
+
 class TaskManager:
     """
     Manages tasks with CRUD operations and JSON persistence.
     
+    A filepath ending in ``.jsonl`` is treated as an append-only log: each
+    mutation appends a single JSON record instead of rewriting the whole
+    file, and the log is compacted once it grows well past the live tasks.
+    A torn final record left by a crash mid-append is dropped on load and
+    the log rewritten.
+    A filepath ending in ``.msgpack`` stores tasks in the compact binary
+    MessagePack format (requires the optional ``msgpack`` package).
+    
+    A task file of any format that cannot be read is never written to, so
+    a later save can't replace the user's data with a near-empty list.
+    
+    Used as a context manager, the TaskManager batches mutations and writes
+    them to disk once on exit::
+    
+        with TaskManager() as tm:
+            tm.add_task("First")
+            tm.add_task("Second")
+    
+    Tasks are loaded lazily on first access, so creating a TaskManager
+    does no disk I/O.
+    
     Attributes:
         filepath (Path): Path to the JSON file storing tasks
         tasks (List[Dict]): List of task dictionaries
     """
     
+    # Compact the log once it holds this many records per live task
+    COMPACT_RATIO = 2
+    
     def __init__(self, filepath: str = "tasks.json"):
         """
         Initialize the TaskManager.
         
         Args:
             filepath: Path to the JSON file for task storage
+            
+        Raises:
+            ImportError: If filepath ends in .msgpack and msgpack is not installed
         """
         self.filepath = Path(filepath)
-        self.tasks: List[Dict] = []
-        self.load_tasks()
+        self._msgpack = _import_msgpack() if self.filepath.suffix == '.msgpack' else None
+        # Insertion-ordered id -> task map; this is the task store itself
+        self._by_id: Dict[int, Dict] = {}
+        self._loaded = False
+        # Field value -> {task id: None}; dicts act as insertion-ordered
+        # sets so filtered views list tasks in the same order as the store
+        self._by_category: Dict[Optional[str], Dict[int, None]] = {}
+        self._by_priority: Dict[Optional[str], Dict[int, None]] = {}
+        self._next_id = 1
+        self._is_log = self.filepath.suffix == '.jsonl'
+        self._log_records = 0
+        # Set when the task file could not be read; blocks writes to it
+        self._unreadable = False
+        self._pending_records: List[bytes] = []
+        self._batch_depth = 0
+        self._dirty = False
+        # Bumped on every change to the task list; keys the search cache
+        self._version = 0
+        self._desc_lower: Optional[List[str]] = None
+        self._search_ids = lru_cache(maxsize=128)(self._match_ids)
+    
+    @property
+    def tasks(self) -> List[Dict]:
+        """List of task dictionaries in insertion order, loaded from disk on first access."""
+        self._ensure_loaded()
+        return list(self._by_id.values())
+    
+    def _ensure_loaded(self) -> None:
+        """Load tasks from disk if they haven't been loaded yet."""
+        if not self._loaded:
+            self.load_tasks()
+    
+    def __enter__(self) -> "TaskManager":
+        """Start a batch: mutations are held in memory until the batch ends."""
+        self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """End a batch, flushing queued mutations to disk in one write."""
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        
+        if self._dirty:
+            self._dirty = False
+            self.save_tasks()
+        else:
+            self._flush_records()
     
     def load_tasks(self) -> None:
         """Load tasks from JSON file. Creates file if it doesn't exist."""
-        try:
-            if self.filepath.exists():
-                with open(self.filepath, 'r') as f:
-                    self.tasks = json.load(f)
-                print(f"✓ Loaded {len(self.tasks)} tasks from {self.filepath}")
+        self._loaded = True
+        self._by_id = {}
+        self._by_category = {}
+        self._by_priority = {}
+        self._unreadable = False
+        tasks: List[Dict] = []
+        contents = b''
+        
+        if not self.filepath.exists():
+            self.save_tasks()
+            print(f"✓ Created new task file: {self.filepath}")
+        else:
+            contents = self.filepath.read_bytes()
+            # Only decoding is guarded: JSON, orjson and msgpack decode
+            # errors and wrongly shaped tasks are ValueErrors; malformed log
+            # records raise KeyError or TypeError
+            try:
+                if not contents.strip():
+                    self._log_records = 0
+                elif self._is_log:
+                    tasks = _check_tasks(self._replay_log(contents))
+                else:
+                    tasks = _check_tasks(self._decode_snapshot(contents))
+            except (ValueError, KeyError, TypeError):
+                print(f"⚠ Error reading {self.filepath}. Starting with empty task list.")
+                self._unreadable = True
             else:
-                self.tasks = []
-                self.save_tasks()
-                print(f"✓ Created new task file: {self.filepath}")
-        except json.JSONDecodeError:
-            print(f"⚠ Error reading {self.filepath}. Starting with empty task list.")
-            self.tasks = []
-        except Exception as e:
-            print(f"⚠ Unexpected error loading tasks: {e}")
-            self.tasks = []
+                print(f"✓ Loaded {len(tasks)} tasks from {self.filepath}")
+        
+        duplicates = []
+        for task in tasks:
+            for field, default in _TASK_DEFAULTS.items():
+                task.setdefault(field, default)
+            if task['due_date']:
+                task['due_date'] = _normalize_due_date(task['due_date'])
+            if task['id'] in self._by_id:
+                duplicates.append(task)
+            else:
+                self._index_task(task)
+        self._next_id = max(self._by_id, default=0) + 1
+        
+        # Keep tasks that share an ID (e.g. from a hand-edited file) by
+        # giving each later copy a fresh ID instead of dropping it
+        for task in duplicates:
+            print(f"⚠ Duplicate task ID #{task['id']} in {self.filepath}; "
+                  f"renumbered to #{self._next_id}")
+            task['id'] = self._next_id
+            self._next_id += 1
+            self._index_task(task)
+        self._invalidate_caches()
+        
+        # A log not ending in a newline was torn mid-append; rewrite it so
+        # new records don't get glued onto the partial line
+        if (self._is_log and contents and not self._unreadable
+                and not contents.endswith(b'\n')):
+            self.compact()
     
     def save_tasks(self) -> None:
-        """Save tasks to JSON file."""
+        """Save tasks to JSON file. Deferred until the end of a batch."""
+        if self._batch_depth:
+            self._dirty = True
+            return
+        
+        if self._is_log:
+            self.compact()
+            return
+        
+        if self._refuse_unreadable():
+            return
+        
+        try:
+            self._write_atomic(self._encode_snapshot())
+        except Exception as e:
+            print(f"✗ Error saving tasks: {e}")
+    
+    def compact(self) -> None:
+        """Atomically rewrite the task log so it holds one record per live task."""
+        self._ensure_loaded()
+        if self._refuse_unreadable():
+            return
+        
         try:
-            with open(self.filepath, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            self._write_atomic(b''.join(
+                _dumps({'op': 'add', 'task': task}) + b'\n' for task in self._by_id.values()
+            ))
+            self._log_records = len(self._by_id)
+            self._pending_records.clear()
         except Exception as e:
             print(f"✗ Error saving tasks: {e}")
     
+    def _encode_snapshot(self) -> bytes:
+        """Serialize the full task list in the task file's format."""
+        if self._msgpack:
+            return self._msgpack.packb(self.tasks, use_bin_type=True)
+        return _dumps(self.tasks, indent=True)
+    
+    def _decode_snapshot(self, data: bytes) -> List[Dict]:
+        """Deserialize a full task list from the task file's format."""
+        if self._msgpack:
+            return self._msgpack.unpackb(data, raw=False)
+        return _loads(data)
+    
+    def _write_atomic(self, data: bytes) -> None:
+        """
+        Replace the task file with data without ever leaving it half-written.
+        
+        The data is written to a temporary file next to the task file,
+        flushed to disk, and then renamed over it, so a crash or power loss
+        mid-write keeps the previous file. The temporary file is removed if
+        anything fails.
+        """
+        tmp = self.filepath.with_name(self.filepath.name + '.tmp')
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filepath)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+    
+    def _replay_log(self, contents: bytes) -> List[Dict]:
+        """
+        Rebuild the task list by replaying every record in the task log.
+        
+        An undecodable final record is treated as a torn append and dropped.
+        
+        Raises:
+            ValueError: If any earlier record cannot be decoded
+        """
+        tasks: Dict[int, Dict] = {}
+        records = 0
+        lines = [line for line in contents.splitlines() if line.strip()]
+        for index, line in enumerate(lines):
+            try:
+                record = _loads(line)
+            except ValueError:
+                if index < len(lines) - 1:
+                    raise
+                print(f"⚠ Dropping incomplete last record in {self.filepath}")
+                break
+            records += 1
+            op = record['op']
+            if op == 'add':
+                tasks[record['task']['id']] = record['task']
+            elif op == 'complete':
+                task = tasks[record['id']]
+                task['completed'] = True
+                task['completed_at'] = record['completed_at']
+            elif op == 'delete':
+                tasks.pop(record['id'], None)
+        self._log_records = records
+        return list(tasks.values())
+    
+    def _append_record(self, op: str, **payload) -> None:
+        """
+        Persist a single mutation.
+        
+        For a task log this appends one record; plain JSON files are
+        rewritten in full via save_tasks.
+        
+        Args:
+            op: Operation name ('add', 'complete' or 'delete')
+            **payload: Fields stored alongside the operation
+        """
+        self._invalidate_caches()
+        
+        if not self._is_log:
+            self.save_tasks()
+            return
+        
+        self._pending_records.append(_dumps({'op': op, **payload}) + b'\n')
+        if not self._batch_depth:
+            self._flush_records()
+    
+    def _index_task(self, task: Dict) -> None:
+        """Add a task to the store and its category and priority indexes."""
+        self._by_id[task['id']] = task
+        self._by_category.setdefault(task['category'], {})[task['id']] = None
+        self._by_priority.setdefault(task['priority'], {})[task['id']] = None
+    
+    def _unindex_task(self, task: Dict) -> None:
+        """Remove a task from the store and its category and priority indexes."""
+        del self._by_id[task['id']]
+        del self._by_category[task['category']][task['id']]
+        del self._by_priority[task['priority']][task['id']]
+    
+    def _refuse_unreadable(self) -> bool:
+        """Report and return True if the task file must not be written to."""
+        if self._unreadable:
+            self._pending_records.clear()
+            print(f"✗ Error saving tasks: {self.filepath} could not be read; "
+                  "fix or remove it before making changes")
+        return self._unreadable
+    
+    def _invalidate_caches(self) -> None:
+        """Mark cached search data as stale after the task list changes."""
+        self._version += 1
+        self._desc_lower = None
+    
+    def _flush_records(self) -> None:
+        """Append queued log records in a single write, compacting if needed."""
+        if not self._pending_records or self._refuse_unreadable():
+            return
+        
+        records = self._log_records + len(self._pending_records)
+        if records > self.COMPACT_RATIO * max(len(self._by_id), 1):
+            self.compact()
+            return
+        
+        try:
+            with open(self.filepath, 'ab', buffering=8192) as f:
+                f.write(b''.join(self._pending_records))
+            self._log_records = records
+        except Exception as e:
+            print(f"✗ Error saving tasks: {e}")
+        self._pending_records.clear()
+    
     def add_task(
         self, 
         description: str, 
@@ -87,38 +448,105 @@ class TaskManager:
         Raises:
             ValueError: If due_date format is invalid
         """
+        self._ensure_loaded()
+        task = self._build_task(description, due_date, priority, category, self._next_id)
+        self._next_id += 1
+        self._index_task(task)
+        self._append_record('add', task=task)
+        print(f"✓ Task #{task['id']} added successfully!")
+        return task
+    
+    def add_many(self, tasks: List[Dict]) -> List[Dict]:
+        """
+        Add several tasks and write them to disk once.
+        
+        Every task is validated before any is added, so an invalid entry
+        leaves the task list untouched. All tasks in the batch share the
+        same 'created_at' timestamp: the time of the import.
+        
+        Args:
+            tasks: Dictionaries with a 'description' and optional
+                'due_date', 'priority' and 'category' keys
+            
+        Returns:
+            The created task dictionaries
+            
+        Raises:
+            ValueError: If any task fails validation
+        """
+        self._ensure_loaded()
+        for index, fields in enumerate(tasks):
+            if not isinstance(fields, dict):
+                raise ValueError(f"Task #{index + 1} in the batch must be a dictionary")
+        
+        now_iso = datetime.now().isoformat()
+        created = [
+            self._build_task(
+                fields.get('description', ''),
+                fields.get('due_date'),
+                fields.get('priority', 'medium'),
+                fields.get('category'),
+                self._next_id + offset,
+                created_at=now_iso
+            )
+            for offset, fields in enumerate(tasks)
+        ]
+        self._next_id += len(created)
+        
+        with self:
+            for task in created:
+                self._index_task(task)
+                self._append_record('add', task=task)
+        print(f"✓ Added {len(created)} tasks successfully!")
+        return created
+    
+    def _build_task(
+        self,
+        description: str,
+        due_date: Optional[str],
+        priority: str,
+        category: Optional[str],
+        task_id: int,
+        created_at: Optional[str] = None
+    ) -> Dict:
+        """
+        Validate task fields and build a new task dictionary.
+        
+        created_at defaults to the current time.
+        
+        Raises:
+            ValueError: If any field is invalid
+        """
+        if not isinstance(description, str):
+            raise ValueError("Task description must be a string")
         if not description.strip():
             raise ValueError("Task description cannot be empty")
         
         # Validate due date if provided
         if due_date:
+            if not isinstance(due_date, str):
+                raise ValueError("Due date must be in YYYY-MM-DD format")
             try:
-                datetime.strptime(due_date, "%Y-%m-%d")
+                _parse_due_date(due_date)
             except ValueError:
                 raise ValueError("Due date must be in YYYY-MM-DD format")
         
         # Validate priority
-        try:
-            Priority(priority.lower())
-        except ValueError:
-            raise ValueError(f"Priority must be one of: {', '.join([p.value for p in Priority])}")
+        if not isinstance(priority, str):
+            raise ValueError(_PRIORITY_ERR)
+        priority = priority.lower()
+        if priority not in _PRIORITIES:
+            raise ValueError(_PRIORITY_ERR)
         
-        task_id = max([t.get('id', 0) for t in self.tasks], default=0) + 1
-        
-        task = {
+        return {
             'id': task_id,
             'description': description.strip(),
             'due_date': due_date,
-            'priority': priority.lower(),
+            'priority': priority,
             'category': category,
             'completed': False,
-            'created_at': datetime.now().isoformat()
+            'created_at': created_at or datetime.now().isoformat()
         }
-        
-        self.tasks.append(task)
-        self.save_tasks()
-        print(f"✓ Task #{task_id} added successfully!")
-        return task
     
     def view_tasks(
         self, 
@@ -135,80 +563,103 @@ class TaskManager:
             category: Filter by category
             priority: Filter by priority
         """
-        if not self.tasks:
+        self._ensure_loaded()
+        if not self._by_id:
             print("\n📋 No tasks yet. Add one to get started!")
             return
         
-        # Filter tasks
-        filtered_tasks = self.tasks
-        
-        if completed_only:
-            filtered_tasks = [t for t in filtered_tasks if t['completed']]
-        elif not show_completed:
-            filtered_tasks = [t for t in filtered_tasks if not t['completed']]
-        
-        if category:
-            filtered_tasks = [t for t in filtered_tasks if t.get('category') == category]
-        
-        if priority:
-            filtered_tasks = [t for t in filtered_tasks if t.get('priority') == priority.lower()]
-        
-        if not filtered_tasks:
+        # Narrow to matching tasks through the category/priority indexes
+        priority_l = priority.lower() if priority else None
+        if category or priority_l:
+            ids = None
+            if category:
+                ids = self._by_category.get(category, {})
+            if priority_l:
+                by_priority = self._by_priority.get(priority_l, {})
+                if ids is None:
+                    ids = by_priority
+                else:
+                    # Walk the smaller index; both are in store order
+                    small, large = sorted((ids, by_priority), key=len)
+                    ids = [task_id for task_id in small if task_id in large]
+            candidates = [self._by_id[task_id] for task_id in ids]
+        else:
+            candidates = self._by_id.values()
+        
+        # Separate tasks by status in a single pass
+        pending = []
+        completed = []
+        
+        for t in candidates:
+            if t['completed']:
+                if completed_only or show_completed:
+                    completed.append(t)
+            elif not completed_only:
+                pending.append(t)
+        
+        if not pending and not completed:
             print("\n📋 No tasks match your filters.")
             return
         
-        # Separate and sort tasks
-        pending = [t for t in filtered_tasks if not t['completed']]
-        completed = [t for t in filtered_tasks if t['completed']]
+        today = date.today()
+        # Output lines are collected and written to stdout in one call
+        out: List[str] = []
         
         # Display pending tasks
         if pending:
-            print("\n" + "="*60)
-            print("📌 PENDING TASKS")
-            print("="*60)
-            for task in sorted(pending, key=lambda x: x.get('due_date') or '9999-99-99'):
-                self._print_task(task)
+            out.append("\n" + "="*60)
+            out.append("📌 PENDING TASKS")
+            out.append("="*60)
+            # Undated tasks sort last; sort in place to skip the extra copy
+            pending.sort(key=lambda x: x['due_date'] or '9999-99-99')
+            for task in pending:
+                self._print_task(task, today, out)
         
         # Display completed tasks
         if completed and show_completed:
-            print("\n" + "="*60)
-            print("✓ COMPLETED TASKS")
-            print("="*60)
+            out.append("\n" + "="*60)
+            out.append("✓ COMPLETED TASKS")
+            out.append("="*60)
             for task in completed:
-                self._print_task(task)
+                self._print_task(task, today, out)
         
         # Summary
-        print("\n" + "-"*60)
-        print(f"Total: {len(filtered_tasks)} tasks ({len(pending)} pending, {len(completed)} completed)")
-        print("-"*60 + "\n")
+        out.append("\n" + "-"*60)
+        out.append(f"Total: {len(pending) + len(completed)} tasks ({len(pending)} pending, {len(completed)} completed)")
+        out.append("-"*60 + "\n")
+        sys.stdout.write("\n".join(out) + "\n")
     
-    def _print_task(self, task: Dict) -> None:
-        """Helper method to print a single task."""
+    def _print_task(self, task: Dict, today: date, out: List[str]) -> None:
+        """Helper method to format a single task relative to today's date into out."""
         status = "✓" if task['completed'] else "○"
-        priority_icon = {"low": "◇", "medium": "◆", "high": "◆◆"}
         
-        print(f"\n{status} Task #{task['id']}")
-        print(f"  {task['description']}")
+        out.append(f"\n{status} Task #{task['id']}")
+        out.append(f"  {task['description']}")
         
-        if task.get('due_date'):
-            due = datetime.strptime(task['due_date'], "%Y-%m-%d")
-            days_until = (due - datetime.now()).days
+        if task['due_date']:
+            try:
+                days_until = (_parse_due_date(task['due_date']) - today).days
+            except ValueError:
+                # Unparseable date from a hand-edited file: show it as-is
+                days_until = None
             
-            if days_until < 0:
+            if days_until is None:
+                due_text = "invalid date"
+            elif days_until < 0:
                 due_text = f"⚠ OVERDUE by {abs(days_until)} days"
             elif days_until == 0:
                 due_text = "⚠ DUE TODAY"
             else:
                 due_text = f"Due in {days_until} days"
             
-            print(f"  📅 {task['due_date']} ({due_text})")
+            out.append(f"  📅 {task['due_date']} ({due_text})")
         
-        if task.get('priority'):
-            icon = priority_icon.get(task['priority'], "◇")
-            print(f"  {icon} Priority: {task['priority'].upper()}")
+        if task['priority']:
+            icon = _PRIORITY_ICON.get(task['priority'], "◇")
+            out.append(f"  {icon} Priority: {task['priority'].upper()}")
         
-        if task.get('category'):
-            print(f"  🏷  Category: {task['category']}")
+        if task['category']:
+            out.append(f"  🏷  Category: {task['category']}")
     
     def complete_task(self, task_id: int) -> None:
         """
@@ -228,7 +679,7 @@ class TaskManager:
         
         task['completed'] = True
         task['completed_at'] = datetime.now().isoformat()
-        self.save_tasks()
+        self._append_record('complete', id=task_id, completed_at=task['completed_at'])
         print(f"✓ Task #{task_id} marked as complete!")
     
     def delete_task(self, task_id: int) -> None:
@@ -242,8 +693,8 @@ class TaskManager:
             ValueError: If task_id is not found
         """
         task = self._find_task(task_id)
-        self.tasks.remove(task)
-        self.save_tasks()
+        self._unindex_task(task)
+        self._append_record('delete', id=task_id)
         print(f"✓ Task #{task_id} deleted successfully!")
     
     def search_tasks(self, query: str) -> None:
@@ -253,18 +704,34 @@ class TaskManager:
         Args:
             query: Search term
         """
-        query_lower = query.lower()
-        results = [t for t in self.tasks if query_lower in t['description'].lower()]
+        self._ensure_loaded()
+        ids = self._search_ids(query.lower(), self._version)
+        results = [self._by_id[task_id] for task_id in ids]
         
         if not results:
             print(f"\n🔍 No tasks found matching '{query}'")
             return
         
-        print(f"\n🔍 Found {len(results)} task(s) matching '{query}':")
-        print("="*60)
+        today = date.today()
+        out = [f"\n🔍 Found {len(results)} task(s) matching '{query}':", "="*60]
         for task in results:
-            self._print_task(task)
-        print()
+            self._print_task(task, today, out)
+        out.append("")
+        sys.stdout.write("\n".join(out) + "\n")
+    
+    def _match_ids(self, query_lower: str, version: int) -> tuple:
+        """
+        Return the IDs of tasks whose description contains query_lower.
+        
+        Memoized per instance on (query_lower, version), so repeated
+        searches against an unchanged task list skip the scan entirely.
+        """
+        if self._desc_lower is None:
+            self._desc_lower = [t['description'].lower() for t in self._by_id.values()]
+        return tuple(
+            t['id'] for t, desc in zip(self._by_id.values(), self._desc_lower)
+            if query_lower in desc
+        )
     
     def _find_task(self, task_id: int) -> Dict:
         """
@@ -279,14 +746,85 @@ class TaskManager:
         Raises:
             ValueError: If task is not found
         """
-        for task in self.tasks:
-            if task['id'] == task_id:
-                return task
-        raise ValueError(f"Task #{task_id} not found")
+        self._ensure_loaded()
+        try:
+            return self._by_id[task_id]
+        except KeyError:
+            raise ValueError(f"Task #{task_id} not found") from None
 
 
-def main():
-    """Main CLI entry point."""
+def _add_add_parser(subparsers) -> None:
+    """Register the 'add' command."""
+    add_parser = subparsers.add_parser('add', help='Add a new task')
+    add_parser.add_argument('description', help='Task description')
+    add_parser.add_argument('--due', help='Due date (YYYY-MM-DD)')
+    add_parser.add_argument('--priority', choices=['low', 'medium', 'high'], 
+                           default='medium', help='Task priority')
+    add_parser.add_argument('--category', help='Task category')
+
+
+def _add_list_parser(subparsers) -> None:
+    """Register the 'list' command."""
+    list_parser = subparsers.add_parser('list', help='View all tasks')
+    list_parser.add_argument('--pending-only', action='store_true', 
+                            help='Show only pending tasks')
+    list_parser.add_argument('--completed-only', action='store_true', 
+                            help='Show only completed tasks')
+    list_parser.add_argument('--category', help='Filter by category')
+    list_parser.add_argument('--priority', choices=['low', 'medium', 'high'],
+                            help='Filter by priority')
+
+
+def _add_complete_parser(subparsers) -> None:
+    """Register the 'complete' command."""
+    complete_parser = subparsers.add_parser('complete', help='Mark task as complete')
+    complete_parser.add_argument('task_id', type=int, help='Task ID to complete')
+
+
+def _add_delete_parser(subparsers) -> None:
+    """Register the 'delete' command."""
+    delete_parser = subparsers.add_parser('delete', help='Delete a task')
+    delete_parser.add_argument('task_id', type=int, help='Task ID to delete')
+
+
+def _add_search_parser(subparsers) -> None:
+    """Register the 'search' command."""
+    search_parser = subparsers.add_parser('search', help='Search tasks')
+    search_parser.add_argument('query', help='Search term')
+
+
+def _add_batch_parser(subparsers) -> None:
+    """Register the 'batch' command."""
+    subparsers.add_parser(
+        'batch',
+        help='Run newline-delimited commands from stdin, saving once'
+    )
+
+
+# Subcommand name -> function registering its subparser
+_COMMANDS = {
+    'add': _add_add_parser,
+    'list': _add_list_parser,
+    'complete': _add_complete_parser,
+    'delete': _add_delete_parser,
+    'search': _add_search_parser,
+    'batch': _add_batch_parser,
+}
+
+
+def _build_parser(
+    command: Optional[str] = None,
+    file_option: bool = True
+) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser.
+    
+    Args:
+        command: The subcommand about to be parsed. When it names a known
+            command only that subparser is built; otherwise (e.g. for
+            --help) every subparser is registered.
+        file_option: Whether to accept the global --file option
+    """
     parser = argparse.ArgumentParser(
         description="CLI Task Manager - Manage your tasks from the command line",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -299,82 +837,144 @@ Examples:
   %(prog)s complete 1
   %(prog)s search "Python"
   %(prog)s delete 1
+  %(prog)s batch < commands.txt
+  %(prog)s --file tasks.jsonl add "Appended to a task log"
         """
     )
+    if file_option:
+        parser.add_argument(
+            '--file',
+            default=os.environ.get('TASK_MANAGER_FILE', 'tasks.json'),
+            help='Task file; .jsonl uses an append-only log, .msgpack a binary '
+                 'format (default: $TASK_MANAGER_FILE or tasks.json)'
+        )
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    # Add command
-    add_parser = subparsers.add_parser('add', help='Add a new task')
-    add_parser.add_argument('description', help='Task description')
-    add_parser.add_argument('--due', help='Due date (YYYY-MM-DD)')
-    add_parser.add_argument('--priority', choices=['low', 'medium', 'high'], 
-                           default='medium', help='Task priority')
-    add_parser.add_argument('--category', help='Task category')
+    if command in _COMMANDS:
+        _COMMANDS[command](subparsers)
+    else:
+        for add_subparser in _COMMANDS.values():
+            add_subparser(subparsers)
     
-    # List command
-    list_parser = subparsers.add_parser('list', help='View all tasks')
-    list_parser.add_argument('--pending-only', action='store_true', 
-                            help='Show only pending tasks')
-    list_parser.add_argument('--completed-only', action='store_true', 
-                            help='Show only completed tasks')
-    list_parser.add_argument('--category', help='Filter by category')
-    list_parser.add_argument('--priority', choices=['low', 'medium', 'high'],
-                            help='Filter by priority')
+    return parser
+
+
+def _run_command(tm: TaskManager, args: argparse.Namespace) -> None:
+    """Dispatch a parsed CLI command to the task manager."""
+    if args.command == 'add':
+        tm.add_task(
+            args.description,
+            due_date=args.due,
+            priority=args.priority,
+            category=args.category
+        )
     
-    # Complete command
-    complete_parser = subparsers.add_parser('complete', help='Mark task as complete')
-    complete_parser.add_argument('task_id', type=int, help='Task ID to complete')
+    elif args.command == 'list':
+        if args.completed_only:
+            tm.view_tasks(
+                show_completed=True,
+                category=args.category,
+                priority=args.priority,
+                completed_only=True
+            )
+        else:
+            tm.view_tasks(
+                show_completed=not args.pending_only,
+                category=args.category,
+                priority=args.priority
+            )
     
-    # Delete command
-    delete_parser = subparsers.add_parser('delete', help='Delete a task')
-    delete_parser.add_argument('task_id', type=int, help='Task ID to delete')
+    elif args.command == 'complete':
+        tm.complete_task(args.task_id)
     
-    # Search command
-    search_parser = subparsers.add_parser('search', help='Search tasks')
-    search_parser.add_argument('query', help='Search term')
+    elif args.command == 'delete':
+        tm.delete_task(args.task_id)
+    
+    elif args.command == 'search':
+        tm.search_tasks(args.query)
+
+
+def _run_batch(tm: TaskManager, lines) -> None:
+    """
+    Run one CLI command per line inside a single batch.
     
+    Blank lines and lines starting with '#' are skipped. A failing line is
+    reported and the remaining lines still run.
+    
+    Args:
+        tm: Task manager to run the commands against
+        lines: Iterable of command lines, e.g. sys.stdin
+    """
+    import shlex
+    
+    # One parser per command, built the first time that command appears.
+    # They lack --file: every line runs against the batch's own task file.
+    parsers: Dict[str, argparse.ArgumentParser] = {}
+    
+    with tm:
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            try:
+                argv = shlex.split(line)
+            except ValueError:
+                print(f"✗ Error: line {lineno}: invalid command: {line}")
+                continue
+            
+            if any(arg == '--file' or arg.startswith('--file=') for arg in argv):
+                print(f"✗ Error: line {lineno}: --file is not allowed inside batch")
+                continue
+            
+            try:
+                if argv[0] not in parsers:
+                    parsers[argv[0]] = _build_parser(argv[0], file_option=False)
+                args = parsers[argv[0]].parse_args(argv)
+            except (SystemExit, ValueError):
+                print(f"✗ Error: line {lineno}: invalid command: {line}")
+                continue
+            
+            if args.command in (None, 'batch'):
+                print(f"✗ Error: line {lineno}: invalid command: {line}")
+                continue
+            
+            try:
+                _run_command(tm, args)
+            except ValueError as e:
+                print(f"✗ Error: line {lineno}: {e}")
+
+
+def _find_command(argv: List[str]) -> Optional[str]:
+    """Return the subcommand name in argv, skipping the global --file option."""
+    args = iter(argv)
+    for arg in args:
+        if arg == '--file':
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+    return None
+
+
+def main():
+    """Main CLI entry point."""
+    # Only build the subparser for the command being run
+    parser = _build_parser(_find_command(sys.argv[1:]))
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return
     
-    # Initialize task manager
-    tm = TaskManager()
-    
     try:
-        if args.command == 'add':
-            tm.add_task(
-                args.description,
-                due_date=args.due,
-                priority=args.priority,
-                category=args.category
-            )
-        
-        elif args.command == 'list':
-            if args.completed_only:
-                tm.view_tasks(
-                    show_completed=True,
-                    category=args.category,
-                    priority=args.priority,
-                    completed_only=True
-                )
-            else:
-                tm.view_tasks(
-                    show_completed=not args.pending_only,
-                    category=args.category,
-                    priority=args.priority
-                )
-        
-        elif args.command == 'complete':
-            tm.complete_task(args.task_id)
-        
-        elif args.command == 'delete':
-            tm.delete_task(args.task_id)
+        # Initialize task manager
+        tm = TaskManager(args.file)
         
-        elif args.command == 'search':
-            tm.search_tasks(args.query)
+        if args.command == 'batch':
+            _run_batch(tm, sys.stdin)
+        else:
+            _run_command(tm, args)
     
     except ValueError as e:
         print(f"✗ Error: {e}")
@@ -383,4 +983,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,11 +3,15 @@ Test Suite for CLI Task Manager
 Run with: pytest test_task_manager.py -v
 """
 
-import pytest
 import json
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from task_manager import TaskManager, Priority
+
+import pytest
+
+import task_manager as task_manager_module
+from task_manager import TaskManager, Priority, _build_parser, _find_command, _run_batch
 
 
 @pytest.fixture
@@ -38,8 +42,17 @@ class TestTaskManagerInitialization:
     def test_creates_new_file_if_not_exists(self, temp_task_file):
         """Should create a new tasks file if it doesn't exist."""
         tm = TaskManager(filepath=temp_task_file)
-        assert Path(temp_task_file).exists()
         assert tm.tasks == []
+        assert Path(temp_task_file).exists()
+    
+    def test_defers_loading_until_first_access(self, temp_task_file, capsys):
+        """Should not touch the task file until tasks are needed."""
+        tm = TaskManager(filepath=temp_task_file)
+        assert not Path(temp_task_file).exists()
+        assert capsys.readouterr().out == ""
+        
+        tm.add_task("First task")
+        assert Path(temp_task_file).exists()
     
     def test_loads_existing_tasks(self, temp_task_file):
         """Should load tasks from existing file."""
@@ -53,8 +66,47 @@ class TestTaskManagerInitialization:
         tm = TaskManager(filepath=temp_task_file)
         assert len(tm.tasks) == 1
         assert tm.tasks[0]["description"] == "Test task"
+        assert tm.tasks[0]["priority"] is None
     
-    def test_handles_corrupted_json(self, temp_task_file):
+    def test_round_trips_without_orjson(self, temp_task_file, monkeypatch):
+        """Should fall back to the standard json module."""
+        monkeypatch.setattr(task_manager_module, "orjson", None)
+        tm = TaskManager(filepath=temp_task_file)
+        tm.add_task("Stdlib task", category="café")
+        
+        assert TaskManager(filepath=temp_task_file).tasks == tm.tasks
+    
+    def test_normalizes_unpadded_due_dates(self, temp_task_file, capsys):
+        """Should load and display due dates written without zero padding."""
+        with open(temp_task_file, 'w') as f:
+            json.dump([
+                {"id": 1, "description": "Old date", "due_date": "2026-1-5", "completed": False},
+            ], f)
+        
+        tm = TaskManager(filepath=temp_task_file)
+        tm.view_tasks()
+        
+        assert tm.tasks[0]["due_date"] == "2026-01-05"
+        assert "📅 2026-01-05" in capsys.readouterr().out
+    
+    def test_keeps_tasks_with_duplicate_ids(self, temp_task_file, capsys):
+        """Should renumber, not drop, tasks that share an ID."""
+        with open(temp_task_file, 'w') as f:
+            json.dump([
+                {"id": 1, "description": "a", "completed": False},
+                {"id": 1, "description": "b", "completed": False},
+            ], f)
+        
+        tm = TaskManager(filepath=temp_task_file)
+        tm.add_task("c")
+        
+        assert "Duplicate task ID #1" in capsys.readouterr().out
+        reloaded = TaskManager(filepath=temp_task_file)
+        assert [(t["id"], t["description"]) for t in reloaded.tasks] == [
+            (1, "a"), (2, "b"), (3, "c")
+        ]
+    
+    def test_handles_corrupted_json(self, temp_task_file, capsys):
         """Should handle corrupted JSON gracefully."""
         # Write invalid JSON
         with open(temp_task_file, 'w') as f:
@@ -62,6 +114,46 @@ class TestTaskManagerInitialization:
         
         tm = TaskManager(filepath=temp_task_file)
         assert tm.tasks == []
+        
+        captured = capsys.readouterr()
+        assert "Error reading" in captured.out
+        assert "Loaded" not in captured.out
+        
+        # Should refuse to overwrite the unreadable file
+        tm.add_task("New task")
+        assert "could not be read" in capsys.readouterr().out
+        assert Path(temp_task_file).read_text() == "{ invalid json }"
+    
+    @pytest.mark.parametrize("contents", [
+        "null", "5", "[1, 2]", '{"a": 1}', '[{"description": "no id"}]'
+    ])
+    def test_handles_wrongly_shaped_json(self, temp_task_file, capsys, contents):
+        """Should treat valid JSON that isn't a task list like corrupted JSON."""
+        Path(temp_task_file).write_text(contents)
+        
+        tm = TaskManager(filepath=temp_task_file)
+        assert tm.tasks == []
+        
+        captured = capsys.readouterr()
+        assert "Error reading" in captured.out
+        assert "Loaded" not in captured.out
+    
+    def test_handles_wrongly_shaped_log(self, tmp_path, capsys):
+        """Should reject log records that aren't operation objects."""
+        log_file = tmp_path / "tasks.jsonl"
+        log_file.write_text('[1, 2]\n{"op": "add", "task": "oops"}\n')
+        
+        tm = TaskManager(filepath=str(log_file))
+        assert tm.tasks == []
+        assert "Error reading" in capsys.readouterr().out
+    
+    def test_loads_empty_file(self, temp_task_file, capsys):
+        """Should treat an empty file as an empty task list, not an error."""
+        Path(temp_task_file).write_text("")
+        
+        tm = TaskManager(filepath=temp_task_file)
+        assert tm.tasks == []
+        assert "Error reading" not in capsys.readouterr().out
 
 
 class TestAddTask:
@@ -101,6 +193,14 @@ class TestAddTask:
         assert task2["id"] == 2
         assert task3["id"] == 3
     
+    def test_continues_ids_from_loaded_tasks(self, temp_task_file):
+        """Should continue numbering after the highest loaded ID."""
+        with open(temp_task_file, 'w') as f:
+            json.dump([{"id": 7, "description": "Loaded", "completed": False}], f)
+        
+        tm = TaskManager(filepath=temp_task_file)
+        assert tm.add_task("Next task")["id"] == 8
+    
     def test_strips_whitespace_from_description(self, task_manager):
         """Should strip leading/trailing whitespace."""
         task = task_manager.add_task("  Task with spaces  ")
@@ -124,6 +224,12 @@ class TestAddTask:
         
         with pytest.raises(ValueError, match="YYYY-MM-DD format"):
             task_manager.add_task("Task", due_date="invalid")
+        
+        with pytest.raises(ValueError, match="YYYY-MM-DD format"):
+            task_manager.add_task("Task", due_date="20260125")
+        
+        with pytest.raises(ValueError, match="YYYY-MM-DD format"):
+            task_manager.add_task("Task", due_date="2026-02-30")
     
     def test_validates_priority(self, task_manager):
         """Should validate priority values."""
@@ -221,6 +327,13 @@ class TestViewTasks:
         assert "Review code" in captured.out
         assert "Write tests" in captured.out
     
+    def test_pending_sorted_by_due_date(self, task_manager_with_data, capsys):
+        """Should list pending tasks by due date, undated tasks last."""
+        task_manager_with_data.view_tasks()
+        
+        out = capsys.readouterr().out
+        assert out.index("Write tests") < out.index("Complete project") < out.index("Review code")
+    
     def test_view_pending_only(self, task_manager_with_data, capsys):
         """Should show only pending tasks."""
         task_manager_with_data.complete_task(1)
@@ -230,6 +343,16 @@ class TestViewTasks:
         assert "PENDING TASKS" in captured.out
         assert "COMPLETED TASKS" not in captured.out
     
+    def test_view_completed_only(self, task_manager_with_data, capsys):
+        """Should show only completed tasks."""
+        task_manager_with_data.complete_task(1)
+        task_manager_with_data.view_tasks(completed_only=True)
+        
+        captured = capsys.readouterr()
+        assert "Complete project" in captured.out
+        assert "PENDING TASKS" not in captured.out
+        assert "Total: 1 tasks (0 pending, 1 completed)" in captured.out
+    
     def test_filter_by_category(self, task_manager_with_data, capsys):
         """Should filter tasks by category."""
         task_manager_with_data.view_tasks(category="development")
@@ -246,6 +369,34 @@ class TestViewTasks:
         assert "Complete project" in captured.out
         assert "Review code" not in captured.out
     
+    def test_filter_by_category_and_priority(self, task_manager_with_data, capsys):
+        """Should combine category and priority filters."""
+        task_manager_with_data.add_task("Fix bug", priority="high", category="development")
+        task_manager_with_data.delete_task(2)
+        task_manager_with_data.view_tasks(category="development", priority="high")
+        
+        captured = capsys.readouterr()
+        assert "Fix bug" in captured.out
+        assert "Review code" not in captured.out
+        assert "Complete project" not in captured.out
+    
+    def test_filtered_view_keeps_file_order(self, temp_task_file, capsys):
+        """Should list filtered tasks in the same order as unfiltered ones."""
+        with open(temp_task_file, 'w') as f:
+            json.dump([
+                {"id": 5, "description": "Five", "category": "work", "completed": True},
+                {"id": 2, "description": "Two", "category": "work", "completed": True},
+            ], f)
+        
+        tm = TaskManager(filepath=temp_task_file)
+        tm.view_tasks()
+        unfiltered = capsys.readouterr().out
+        tm.view_tasks(category="work")
+        filtered = capsys.readouterr().out
+        
+        assert unfiltered.index("Five") < unfiltered.index("Two")
+        assert filtered.index("Five") < filtered.index("Two")
+    
     def test_empty_task_list(self, task_manager, capsys):
         """Should handle empty task list gracefully."""
         task_manager.view_tasks()
@@ -261,6 +412,18 @@ class TestViewTasks:
         
         captured = capsys.readouterr()
         assert "OVERDUE" in captured.out
+    
+    def test_shows_due_today_and_days_until(self, task_manager, capsys):
+        """Should count days by calendar date."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        task_manager.add_task("Due today", due_date=today)
+        task_manager.add_task("Due tomorrow", due_date=tomorrow)
+        task_manager.view_tasks()
+        
+        captured = capsys.readouterr()
+        assert "DUE TODAY" in captured.out
+        assert "Due in 1 days" in captured.out
 
 
 class TestSearchTasks:
@@ -288,6 +451,16 @@ class TestSearchTasks:
         captured = capsys.readouterr()
         assert "No tasks found" in captured.out
     
+    def test_search_sees_new_tasks(self, task_manager_with_data, capsys):
+        """Should not serve stale cached results after a change."""
+        task_manager_with_data.search_tasks("deploy")
+        task_manager_with_data.add_task("Deploy release")
+        task_manager_with_data.search_tasks("deploy")
+        
+        captured = capsys.readouterr()
+        assert "No tasks found" in captured.out
+        assert "Deploy release" in captured.out
+    
     def test_search_partial_match(self, task_manager_with_data, capsys):
         """Should find partial matches."""
         task_manager_with_data.search_tasks("test")
@@ -340,6 +513,20 @@ class TestEdgeCases:
         # Should not crash when trying to save
         # (will print error but continue)
     
+    def test_failed_save_keeps_previous_file(self, task_manager, temp_task_file, monkeypatch):
+        """Should leave the existing file intact if a save fails midway."""
+        task_manager.add_task("Saved task")
+        
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr(task_manager_module.os, "replace", fail_replace)
+        task_manager.add_task("Lost task")
+        
+        data = json.loads(Path(temp_task_file).read_text())
+        assert [t["description"] for t in data] == ["Saved task"]
+        assert not Path(temp_task_file + ".tmp").exists()
+    
     def test_multiple_tasks_same_due_date(self, task_manager):
         """Should handle multiple tasks with same due date."""
         task_manager.add_task("Task 1", due_date="2026-02-01")
@@ -361,6 +548,207 @@ class TestEdgeCases:
         assert len(task["description"]) == 1000
 
 
+class TestTaskLog:
+    """Test the append-only .jsonl task log."""
+    
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        return str(tmp_path / "tasks.jsonl")
+    
+    def test_mutations_append_records(self, log_file):
+        """Each mutation should append a single line to the log."""
+        tm = TaskManager(filepath=log_file)
+        tm.add_task("First task")
+        tm.add_task("Second task")
+        tm.complete_task(1)
+        
+        lines = Path(log_file).read_text().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["add", "add", "complete"]
+    
+    def test_replays_log_across_instances(self, log_file):
+        """Should rebuild state by replaying the log."""
+        tm1 = TaskManager(filepath=log_file)
+        tm1.add_task("Keep me")
+        tm1.add_task("Delete me")
+        tm1.complete_task(1)
+        tm1.delete_task(2)
+        
+        tm2 = TaskManager(filepath=log_file)
+        assert len(tm2.tasks) == 1
+        assert tm2._find_task(1)["completed"] is True
+    
+    def test_compacts_when_log_grows(self, log_file):
+        """Should rewrite the log once it outgrows the live tasks."""
+        tm = TaskManager(filepath=log_file)
+        tm.add_task("Survivor")
+        for _ in range(5):
+            task = tm.add_task("Temporary")
+            tm.delete_task(task["id"])
+        
+        lines = Path(log_file).read_text().splitlines()
+        assert len(lines) <= TaskManager.COMPACT_RATIO * len(tm.tasks) + 1
+        assert len(TaskManager(filepath=log_file).tasks) == 1
+    
+    def test_recovers_from_torn_last_record(self, log_file):
+        """Should drop a half-written last record and keep appending cleanly."""
+        tm = TaskManager(filepath=log_file)
+        tm.add_task("Task A")
+        tm.add_task("Task B")
+        with open(log_file, 'a') as f:
+            f.write('{"op": "add", "task": {"id": 3, "desc')
+        
+        tm2 = TaskManager(filepath=log_file)
+        assert [t["description"] for t in tm2.tasks] == ["Task A", "Task B"]
+        tm2.add_task("Task C")
+        
+        tm3 = TaskManager(filepath=log_file)
+        assert [(t["id"], t["description"]) for t in tm3.tasks] == [
+            (1, "Task A"), (2, "Task B"), (3, "Task C")
+        ]
+    
+    def test_refuses_to_write_unreadable_log(self, log_file, capsys):
+        """Should not append to a log corrupted before its last record."""
+        Path(log_file).write_text('garbage\n{"op": "add", "task": {"id": 1}}\n')
+        
+        tm = TaskManager(filepath=log_file)
+        assert tm.tasks == []
+        tm.add_task("New task")
+        
+        assert "could not be read" in capsys.readouterr().out
+        assert Path(log_file).read_text().startswith("garbage\n")
+        assert "New task" not in Path(log_file).read_text()
+    
+    def test_compact_from_fresh_instance(self, log_file):
+        """Should load the log before compacting it."""
+        tm = TaskManager(filepath=log_file)
+        tm.add_task("First task")
+        tm.add_task("Second task")
+        
+        TaskManager(filepath=log_file).compact()
+        assert len(TaskManager(filepath=log_file).tasks) == 2
+
+
+class TestBatch:
+    """Test batched mutations and bulk adds."""
+    
+    def test_batch_defers_save_until_exit(self, task_manager, temp_task_file):
+        """Should write to disk only when the batch ends."""
+        task_manager.load_tasks()
+        with task_manager:
+            task_manager.add_task("Batched task")
+            task_manager.complete_task(1)
+            assert json.loads(Path(temp_task_file).read_text()) == []
+        
+        data = json.loads(Path(temp_task_file).read_text())
+        assert data[0]["completed"] is True
+    
+    def test_add_many(self, task_manager, temp_task_file):
+        """Should add all tasks with sequential IDs and persist them."""
+        tasks = task_manager.add_many([
+            {"description": "First"},
+            {"description": "Second", "priority": "high", "category": "work"},
+        ])
+        
+        assert [t["id"] for t in tasks] == [1, 2]
+        assert tasks[1]["priority"] == "high"
+        assert tasks[0]["created_at"] == tasks[1]["created_at"]
+        assert len(TaskManager(filepath=temp_task_file).tasks) == 2
+    
+    def test_add_many_rejects_invalid_batch(self, task_manager):
+        """Should add nothing if any task is invalid."""
+        with pytest.raises(ValueError, match="cannot be empty"):
+            task_manager.add_many([{"description": "Valid"}, {"description": ""}])
+        
+        assert task_manager.tasks == []
+    
+    @pytest.mark.parametrize("entry", [
+        {}, {"description": None}, {"description": 5}, "Not a dict",
+        {"description": "Task", "priority": None},
+        {"description": "Task", "due_date": 20260125},
+    ])
+    def test_add_many_rejects_malformed_entries(self, task_manager, entry):
+        """Should raise ValueError, not AttributeError, for bad entries."""
+        with pytest.raises(ValueError):
+            task_manager.add_many([{"description": "Valid"}, entry])
+        
+        assert task_manager.tasks == []
+    
+    def test_batch_command(self, task_manager, capsys):
+        """Should run each line as a command and report bad lines."""
+        lines = [
+            'add "Write report" --priority high\n',
+            '# comment\n',
+            'add "Review report"\n',
+            'complete 1\n',
+            'complete 42\n',
+        ]
+        _run_batch(task_manager, lines)
+        
+        captured = capsys.readouterr()
+        assert "line 5: Task #42 not found" in captured.out
+        assert len(task_manager.tasks) == 2
+        assert task_manager._find_task(1)["completed"] is True
+    
+    def test_batch_rejects_file_option(self, task_manager, capsys):
+        """Should not silently ignore a per-line --file."""
+        _run_batch(task_manager, ['--file other.json add "D"\n', 'add "E" --file=x.json\n'])
+        
+        captured = capsys.readouterr()
+        assert "line 1: --file is not allowed inside batch" in captured.out
+        assert "line 2: --file is not allowed inside batch" in captured.out
+        assert task_manager.tasks == []
+
+
+class TestCLIParser:
+    """Test lazy subcommand parser construction."""
+    
+    def test_builds_only_requested_subparser(self):
+        """Should register just the command being run."""
+        parser = _build_parser("complete")
+        assert parser.parse_args(["complete", "3"]).task_id == 3
+        
+        with pytest.raises(SystemExit):
+            parser.parse_args(["list"])
+    
+    def test_file_option(self):
+        """Should accept a task file before the subcommand."""
+        argv = ["--file", "tasks.jsonl", "add", "Task"]
+        assert _find_command(argv) == "add"
+        
+        args = _build_parser(_find_command(argv)).parse_args(argv)
+        assert args.file == "tasks.jsonl"
+        assert args.description == "Task"
+    
+    def test_builds_all_subparsers_for_help(self):
+        """Should register every command when none is given."""
+        parser = _build_parser(None)
+        assert parser.parse_args(["list", "--pending-only"]).pending_only is True
+        assert parser.parse_args(["search", "api"]).query == "api"
+
+
+class TestMsgpackStorage:
+    """Test the optional MessagePack task file format."""
+    
+    def test_round_trips_msgpack(self, tmp_path):
+        """Should persist tasks in binary form and load them back."""
+        msgpack = pytest.importorskip("msgpack")
+        msgpack_file = tmp_path / "tasks.msgpack"
+        
+        tm1 = TaskManager(filepath=str(msgpack_file))
+        tm1.add_task("Binary task", due_date="2026-02-01", category="work")
+        tm1.complete_task(1)
+        
+        assert msgpack.unpackb(msgpack_file.read_bytes())[0]["description"] == "Binary task"
+        tm2 = TaskManager(filepath=str(msgpack_file))
+        assert tm2.tasks == tm1.tasks
+    
+    def test_requires_msgpack(self, tmp_path, monkeypatch):
+        """Should fail clearly when msgpack isn't installed."""
+        monkeypatch.setitem(sys.modules, "msgpack", None)
+        with pytest.raises(ImportError, match="msgpack is required"):
+            TaskManager(filepath=str(tmp_path / "tasks.msgpack"))
+
+
 # Integration Tests
 class TestIntegration:
     """Integration tests for complete workflows."""